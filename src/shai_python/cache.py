@@ -0,0 +1,70 @@
+"""
+Local response cache for generated shell commands.
+
+Repeated prompts ("list files by size", "git undo last commit") would
+otherwise pay a full LLM round-trip every time; an exact-match cache keyed
+by (model, provider, system info, prompt) turns them into local lookups.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from shai_python.config import ConfigManager, ShellCommand
+
+# Cached entries expire after 7 days
+DEFAULT_TTL = 7 * 86400
+
+
+def build_cache_key(model_id: str, provider: str, system_info: str, prompt: str) -> str:
+    """Build a deterministic cache key from everything that affects the answer"""
+    payload = json.dumps(
+        {"model": model_id, "provider": provider, "sys": system_info, "prompt": prompt},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Exact-match cache for ShellCommand responses, backed by sqlite"""
+
+    CACHE_FILE = ConfigManager.CONFIG_DIR / "cache.sqlite"
+
+    def __init__(self, path: Path | None = None, ttl: int = DEFAULT_TTL):
+        self.path = path or self.CACHE_FILE
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, cmd TEXT, explanation TEXT, risk TEXT, ts INTEGER)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> ShellCommand | None:
+        """Return the cached command for key, or None if missing/expired"""
+        row = self._conn.execute(
+            "SELECT cmd, explanation, risk, ts FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        cmd, explanation, risk, ts = row
+        if time.time() - ts > self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        return ShellCommand(command=cmd, explanation=explanation, risk=risk)
+
+    def set(self, key: str, shell_cmd: ShellCommand) -> None:
+        """Store a command under key, replacing any previous entry"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, cmd, explanation, risk, ts) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, shell_cmd.command, shell_cmd.explanation, shell_cmd.risk, int(time.time())),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
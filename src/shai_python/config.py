@@ -1,14 +1,49 @@
-import importlib.resources as pkg_resources
 import os
+import pickle
 import platform
 import re
+import shutil
+from importlib.resources import files
 from pathlib import Path
 
-import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+try:
+    # libyaml's C loader parses several times faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 from shai_python.strings import _
 
+# ${VAR} reference, compiled once; undefined variables are left verbatim
+_ENVVAR_RE = re.compile(r"\$\{(\w+)\}")
+
+
+def _sub_env(match: re.Match) -> str:
+    return os.getenv(match.group(1), match.group(0))
+
+
+class _EnvVarLoader(_YamlLoader):
+    """SafeLoader that expands ${VAR} references while constructing string scalars"""
+
+    # Set to True during a parse when any scalar contains a ${VAR} reference
+    env_referenced = False
+
+
+def _construct_str_with_env(loader: _EnvVarLoader, node) -> str:
+    value = loader.construct_scalar(node)
+    if _ENVVAR_RE.search(value):
+        loader.env_referenced = True
+        return _ENVVAR_RE.sub(_sub_env, value)
+    return value
+
+
+# Overriding the str constructor reaches every string scalar, quoted or
+# plain — an implicit resolver would only see plain ones, missing the
+# quoted "${...}" form the shipped template uses
+_EnvVarLoader.add_constructor("tag:yaml.org,2002:str", _construct_str_with_env)
+
 # ANSI color codes for colored output
 GREEN = "\033[92m"  # Green for safe
 YELLOW = "\033[93m"  # Yellow for caution
@@ -16,6 +51,13 @@ RED = "\033[91m"  # Red for danger
 RESET = "\033[0m"  # Reset color
 BOLD = "\033[1m"  # Bold text
 
+# Risk level to display color
+risk_color = {
+    "safe": GREEN,
+    "caution": YELLOW,
+    "danger": RED,
+}
+
 
 class ProviderConfig(BaseModel):
     api_key: str = Field(..., min_length=1, description="API key cannot be empty")
@@ -32,6 +74,18 @@ class GlobalConfig(BaseModel):
     default_model: str = Field(..., min_length=1, description='effective model')
     providers: dict[str, ProviderConfig]
     models: list[ModelConfig]
+    enable_cache: bool = Field(True, description="Cache generated commands for repeated prompts")
+
+    # Models indexed by id and alias, built once after validation
+    _by_name: dict[str, ModelConfig] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        self._by_name = {m.id: m for m in self.models}
+        self._by_name.update({m.alias: m for m in self.models if m.alias})
+
+    def find_model(self, name: str) -> ModelConfig | None:
+        """Look up a model by id or alias"""
+        return self._by_name.get(name)
 
 
 class ShellCommand(BaseModel):
@@ -46,6 +100,8 @@ class ConfigManager:
     # Use configuration directory in current working directory to avoid permission issues
     CONFIG_DIR = Path.home() / ".config" / APP_NAME
     CONFIG_FILE = CONFIG_DIR / "config.yaml"
+    # Parsed config cached on disk, invalidated when config.yaml changes
+    CONFIG_CACHE_FILE = CONFIG_DIR / "config.pkl"
 
     @classmethod
     def ensure_config(cls) -> bool:
@@ -53,11 +109,11 @@ class ConfigManager:
         if not cls.CONFIG_FILE.exists():
             cls.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
             try:
-                # Use importlib.resources to read template from package
-                # Assume template is in shai_python package
-                template_data = pkg_resources.read_text("shai_python", "config.template.yaml")
-                with open(cls.CONFIG_FILE, "w", encoding="utf-8") as f:
-                    f.write(template_data)
+                # Stream the template from the package straight to disk,
+                # skipping the decode+encode round trip of read_text
+                template = files("shai_python").joinpath("config.template.yaml")
+                with template.open("rb") as src, open(cls.CONFIG_FILE, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
                 return True  # Indicates first-time initialization
             except Exception as e:
                 print(_("config_init_error", error=e))
@@ -93,11 +149,54 @@ class ConfigManager:
         if not cls.CONFIG_FILE.exists():
             raise FileNotFoundError(_("config_file_missing"))
 
-        with open(cls.CONFIG_FILE, "r", encoding="utf-8") as f:
-            # Simple environment variable substitution support (optional)
-            content = f.read()
-            # Match ${VAR} and replace
-            content = re.sub(r"\${(\w+)}", lambda m: os.getenv(m.group(1), m.group(0)), content)
+        stat = cls.CONFIG_FILE.stat()
+        # Field names are part of the tag so a stale pickle from an older
+        # GlobalConfig schema is dropped after a package upgrade
+        tag = (stat.st_mtime_ns, stat.st_size, tuple(sorted(GlobalConfig.model_fields)))
+
+        cached = cls._load_cached(tag)
+        if cached is not None:
+            return cached
+
+        # Binary mode lets the parser consume the stream directly without a
+        # Python-level read+decode of the whole file first
+        with open(cls.CONFIG_FILE, "rb") as f:
+            # ${VAR} references are expanded by _EnvVarLoader during parsing;
+            # the loader is driven by hand so its env_referenced flag can be
+            # read back afterwards
+            loader = _EnvVarLoader(f)
+            try:
+                data = loader.get_single_data()
+            finally:
+                loader.dispose()
+            config = GlobalConfig(**data)
+
+        # A config using ${VAR} must be re-parsed every run: the pickle's tag
+        # can't see the environment, so caching would freeze unresolved
+        # references and write resolved secrets to disk in plaintext
+        if not loader.env_referenced:
+            cls._store_cached(tag, config)
+        return config
+
+    @classmethod
+    def _load_cached(cls, tag: tuple) -> GlobalConfig | None:
+        """Return the cached parsed config if it matches the yaml file's tag"""
+        try:
+            with open(cls.CONFIG_CACHE_FILE, "rb") as f:
+                cached_tag, config = pickle.load(f)
+            if cached_tag == tag and isinstance(config, GlobalConfig):
+                return config
+        except Exception:
+            # Missing or stale cache just means a normal parse
+            pass
+        return None
 
-            data = yaml.safe_load(content)
-            return GlobalConfig(**data)
+    @classmethod
+    def _store_cached(cls, tag: tuple, config: GlobalConfig) -> None:
+        """Persist the parsed config tagged with the yaml file's mtime and size"""
+        try:
+            with open(cls.CONFIG_CACHE_FILE, "wb") as f:
+                pickle.dump((tag, config), f)
+        except Exception:
+            # Cache is best-effort; never fail the load over it
+            pass
@@ -5,30 +5,65 @@ Command line tool that generates shell commands based on user input prompts and
 import os
 import platform
 import re
+import shlex
+import shutil
 import subprocess
 import sys
+from functools import cache
+from typing import TYPE_CHECKING
 
-from pydantic_ai.agent import Agent
-from pydantic_ai.models import Model
 from yaspin import yaspin
 
+if TYPE_CHECKING:
+    from pydantic_ai.models import Model
+
+from shai_python.cache import ResponseCache, build_cache_key
 from shai_python.config import (
-    GREEN,
     RED,
     RESET,
-    YELLOW,
     ConfigManager,
     ModelConfig,
     ProviderConfig,
     ShellCommand,
+    risk_color,
 )
 from shai_python.strings import _
 
-risk_color = {
-    "safe": GREEN,
-    "caution": YELLOW,
-    "danger": RED,
-}
+# Static part of the system prompt, assembled once. Keeping it identical
+# across runs (dynamic system info goes in a separate trailing part) lets
+# providers with prompt caching reuse the prefix.
+_STATIC_PROMPT = (
+    "You are a professional shell command generation assistant. Based on the user's description, generate accurate shell commands."
+    "Also provide brief command explanations and evaluate the risk level."
+    "Risk levels ('safe', harmless commands), 'caution' (may have side effects), or 'danger' (potentially harmful)."
+    "Ensure commands are compatible with the current system environment."
+)
+
+# Characters that require a real shell (pipes, redirects, globs, expansions,
+# comments, ...)
+_SHELL_METACHARS = "|&;<>$`*?()[]{}~=#\n"
+
+# Dangerous command patterns, compiled once as a single alternation
+_DANGEROUS_PATTERN = "|".join(
+    f"(?:{p})"
+    for p in [
+        r"rm\s+-rf\s+/",  # Delete root directory
+        r"rm\s+-rf\s+\$HOME",  # Delete home directory
+        r"rm\s+-rf\s+\*",  # Delete all content in current directory
+        r">\s*/dev/sda",  # Direct write to disk device
+        r"dd\s+if=",  # Disk write command
+        r":\(\)\{\s*:|\s*&\s*\};",  # Fork bomb
+    ]
+)
+
+try:
+    # google-re2's DFA guarantees linear-time matching, keeping the safety
+    # check immune to catastrophic backtracking as patterns are added
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+_DANGEROUS_RE = _re_engine.compile(_DANGEROUS_PATTERN)
 
 
 def format_danger_level(danger_level: str) -> str:
@@ -37,11 +72,12 @@ def format_danger_level(danger_level: str) -> str:
     return f"{color}{danger_level.upper()}{RESET}"
 
 
+@cache
 def get_windows_shell_type():
     try:
         import psutil
         current_process = psutil.Process(os.getpid())
-        for _ in range(5):
+        for _i in range(5):
             parent = current_process.parent()
             if not parent:
                 break
@@ -61,6 +97,7 @@ def get_windows_shell_type():
         return "Unknown"
 
 
+@cache
 def get_system_info():
     """Get system environment information"""
     system = platform.system()  # Linux, Darwin (macOS), Windows
@@ -79,50 +116,62 @@ Shell: {shell}
 def execute_shell_command(command: str):
     """Execute shell command"""
     # Safety check: prevent some dangerous operations
-    dangerous_patterns = [
-        r"rm\s+-rf\s+/",  # Delete root directory
-        r"rm\s+-rf\s+\$HOME",  # Delete home directory
-        r"rm\s+-rf\s+\*",  # Delete all content in current directory
-        r">\s*/dev/sda",  # Direct write to disk device
-        r"dd\s+if=",  # Disk write command
-        r":\(\)\{\s*:|\s*&\s*\};",  # Fork bomb
-    ]
-
-    for pattern in dangerous_patterns:
-        if re.search(pattern, command):
-            print(_("dangerous_pattern_detected", command=command))
-            confirm = input(_("confirm_dangerous_command"))
-            if confirm != "YES":
-                print(_("dangerous_command_cancelled"))
-                return
+    if _DANGEROUS_RE.search(command):
+        print(_("dangerous_pattern_detected", command=command))
+        confirm = input(_("confirm_dangerous_command"))
+        if confirm != "YES":
+            print(_("dangerous_command_cancelled"))
+            return
 
     try:
          # Linux/Mac or Windows CMD
         process_cmd = command
+        use_shell = True
         if platform.system() == "Windows" and get_windows_shell_type() == "PowerShell":
             process_cmd = ["powershell", "-Command", command]
+        elif platform.system() != "Windows" and not any(c in command for c in _SHELL_METACHARS):
+            # On Linux/macOS, plain commands (ls, git status, ...) don't need
+            # the extra /bin/sh process; run the argv directly. Windows stays
+            # on shell=True so cmd builtins like dir/type keep working.
+            try:
+                argv = shlex.split(command)
+            except ValueError:
+                argv = []  # unbalanced quotes etc. -> let the shell sort it out
+            # Only commands that resolve to a real executable skip the
+            # shell; builtins and keywords (cd, export, time, ...) don't
+            if argv and shutil.which(argv[0]):
+                process_cmd = argv
+                use_shell = False
 
         subprocess.run(
             process_cmd,
-            shell=True,
+            shell=use_shell,
             check=True,
             text=True,
         )
 
     except subprocess.CalledProcessError as e:
         print(_("command_execution_failed", exit_code=e.returncode))
+    except FileNotFoundError:
+        # Without a shell an unknown executable raises instead of exiting 127
+        print(_("command_execution_failed", exit_code=127))
+    except OSError:
+        # Likewise for a target that exists but can't be executed (missing +x,
+        # a directory, ...), where a shell would have exited 126
+        print(_("command_execution_failed", exit_code=126))
 
 
 def display_shell_command(shell_cmd: ShellCommand):
     """Show shell command with color"""
     # Get color for command based on danger level
-    command_color = risk_color.get(shell_cmd.risk.lower(), RESET)
+    risk = shell_cmd.risk.lower()
+    command_color = risk_color.get(risk, RESET)
 
     print(f"\ncmd>> {command_color}{shell_cmd.command}{RESET}")
     print(f"{shell_cmd.explanation}\n")
 
     # Decide whether to execute command based on danger level
-    if shell_cmd.risk.lower() == "danger":
+    if risk == "danger":
         response = (
             input(_("risk_level_prompt", risk_level=format_danger_level(shell_cmd.risk)))
             .strip()
@@ -140,7 +189,7 @@ def display_shell_command(shell_cmd: ShellCommand):
         print(_("command_not_executed"))
 
 
-def create_model(model_entry: ModelConfig, provider_info: ProviderConfig) -> Model:
+def create_model(model_entry: ModelConfig, provider_info: ProviderConfig) -> "Model":
     """Create model based on provider"""
     if model_entry.provider == "deepseek":
         from pydantic_ai.models.openai import OpenAIChatModel
@@ -196,7 +245,7 @@ def main():
         config = ConfigManager.load_and_validate()
 
         target_name = config.default_model
-        model_entry = next((m for m in config.models if m.id == target_name or m.alias == target_name), None)
+        model_entry = config.find_model(target_name)
         if not model_entry:
             raise ValueError(_("model_not_found", model_name=target_name))
 
@@ -207,20 +256,38 @@ def main():
         if provider_info.api_key.startswith("$"):
             raise ValueError(_("env_var_not_defined", var_name=provider_info.api_key))
 
-        model = create_model(model_entry, provider_info)
-
-         # Create Agent
-        agent = Agent(
-            model=model,
-            output_type=ShellCommand,
-            system_prompt=(
-                f"You are a professional shell command generation assistant. Based on the user's description, generate accurate shell commands."
-                f"Also provide brief command explanations and evaluate the risk level."
-                f"Risk levels ('safe', harmless commands), 'caution' (may have side effects), or 'danger' (potentially harmful)."
-                f"Ensure commands are compatible with the current system environment.\n\n"
-                f"Current system environment information:\n{system_info}"
-            ),
-        )
+        # Repeated prompts hit the local cache instead of the network.
+        # Only the cache operations themselves are guarded, so an error
+        # while displaying the hit can't fall through to a paid LLM call.
+        cache = None
+        cached = None
+        if config.enable_cache:
+            try:
+                cache = ResponseCache()
+                cache_key = build_cache_key(model_entry.id, model_entry.provider, system_info, user_prompt)
+                cached = cache.get(cache_key)
+            except Exception:
+                # A broken cache must never block command generation
+                cache = None
+                cached = None
+
+        if not cached:
+            model = create_model(model_entry, provider_info)
+
+            # Imported lazily so CLI startup doesn't pay for the SDK on cached runs
+            from pydantic_ai.agent import Agent
+
+             # Create Agent
+            agent = Agent(
+                model=model,
+                output_type=ShellCommand,
+                # Static prefix first, per-machine tail last, so cache-capable
+                # providers can reuse the shared part
+                system_prompt=(
+                    _STATIC_PROMPT,
+                    f"Current system environment information:\n{system_info}",
+                ),
+            )
 
     except Exception as e:
         print(f"{RED}{_('config_init_error', error=e)}{RESET}")
@@ -228,6 +295,10 @@ def main():
         display_shell_command(edit_command)
         return
 
+    if cached:
+        display_shell_command(cached)
+        return
+
     with yaspin(text=_("thinking"), color="yellow") as spinner:
         try:
             result = agent.run_sync(user_prompt)
@@ -235,6 +306,13 @@ def main():
             spinner.fail(_("erorr", error=e))
             exit(1)
 
+    if cache:
+        try:
+            cache.set(cache_key, result.output)
+        except Exception:
+            # A broken cache must never cost the user the generated command
+            pass
+
     display_shell_command(result.output)
 
 if __name__ == "__main__":
@@ -3,132 +3,201 @@ Internationalization module for Shai
 Automatically detects system language and provides appropriate translations
 """
 
-import locale
 import os
+import re
+import sys
+from collections.abc import Callable, Mapping
+from functools import cache
+from types import MappingProxyType
+
+# Matches Chinese locale identifiers: 'zh', 'zh_CN', 'zh-Hans', 'Chinese (Simplified)_China', ...
+_ZH_RE = re.compile(r'zh|chinese', re.IGNORECASE)
+
+# Env-var variant: Chinese locales start with 'zh' ('zh_CN.UTF-8'), while the
+# spelled-out Windows form ('Chinese (Simplified)_China') can sit anywhere
+_ZH_LANG_RE = re.compile(r'^zh|chinese', re.IGNORECASE)
+
+
+class _SafeDict(dict):
+    """Formatting mapping that leaves unknown placeholders intact"""
+
+    def __missing__(self, key: str) -> str:
+        return '{' + key + '}'
+
+
+# Translation tables, built once at import time
+_TRANSLATIONS_EN = MappingProxyType({
+    # Loading messages
+    'thinking': 'Thinking...',
+
+    # Command execution
+    'dangerous_pattern_detected': 'Dangerous command pattern detected: {command}',
+    'confirm_dangerous_command': 'Are you sure you want to execute this dangerous command? (YES/no): ',
+    'dangerous_command_cancelled': 'Dangerous command cancelled.',
+    'command_execution_failed': 'Command execution failed, exit code: {exit_code}',
+    # Shell command display
+    'risk_level_prompt': 'This command has a risk level of {risk_level}, still execute? (YES/no): ',
+    'execute_prompt': '[{risk_level}]Execute this command? (y/N): ',
+    'command_not_executed': 'Command not executed.',
+    # Configuration
+    'config_init_error': 'Error initializing config: {error}',
+    'config_file_missing': 'Configuration file missing.',
+    'config_edit_explanation': "This command will open the configuration file with your default editor.\nYou need to configure the provider's API key and related parameters here so the program can properly call the model interface.\nYou can always display this command with {yellow_shai_config}.",
+    # Errors
+    'error': 'Error: {error}',
+    'model_not_found': 'Model not found: {model_name}',
+    'provider_not_configured': 'Provider not configured: {provider_name}',
+    'env_var_not_defined': 'Environment variable not defined: {var_name}',
+    'task_description_empty': 'Task description cannot be empty',
+})
+
+_TRANSLATIONS_ZH = MappingProxyType({
+    # Loading messages
+    'thinking': '思考中...',
+
+    # Command execution
+    'dangerous_pattern_detected': '检测到危险命令模式: {command}',
+    'confirm_dangerous_command': '确定要执行这个危险命令吗？(YES/no): ',
+    'dangerous_command_cancelled': '危险命令已取消。',
+    'command_execution_failed': '命令执行失败，错误码: {exit_code}',
+    # Shell command display
+    'risk_level_prompt': '此命令的风险等级为 {risk_level}，仍然执行吗？(YES/no): ',
+    'execute_prompt': '[{risk_level}]执行此命令？(y/N): ',
+    'command_not_executed': '命令未执行。',
+    # Configuration
+    'config_init_error': '配置文件错误: {error}',
+    'config_file_missing': '配置文件不存在',
+    'config_edit_explanation': "该命令将使用默认编辑器打开配置文件。\n配置服务商的api key及相关参数，以便程序能够正常调用模型接口。\n任何时候可以通过{yellow_shai_config}显示此命令。",
+    # Errors
+    'error': '错误: {error}',
+    'model_not_found': '找不到模型: {model_name}',
+    'provider_not_configured': '未配置Provider: {provider_name}',
+    'env_var_not_defined': '未定义环境变量: {var_name}',
+    'task_description_empty': '任务描述不能为空',
+})
+
+
+@cache
+def _detect_language() -> str:
+    """
+    Detect system language preference using environment variables and system locale.
+    Prioritizes Chinese (zh) detection, defaults to English (en).
+    The result never changes within a process, so it is computed once.
+    """
+    # 1. Check environment variables (highest priority for Unix/macOS/WSL),
+    # honoring POSIX precedence: LC_ALL overrides LC_MESSAGES overrides LANG
+    env = os.environ
+    lang = env.get('LC_ALL') or env.get('LC_MESSAGES') or env.get('LANG') or ''
+    if lang:
+        # The case-insensitive regex walks the raw value, so no lowered
+        # copy of the string is allocated just for the test
+        return 'zh' if _ZH_LANG_RE.search(lang) else 'en'
+
+    # 2. No env vars set: fall back to system-level locale settings.
+    # locale is imported here so CLI startup doesn't pay its module init
+    # on the common path where the env vars decide.
+    import locale
+
+    # Each probe gets its own try block so a failure in one doesn't skip
+    # the other, and each catches only what that call actually raises.
+    loc = ''
+    try:
+        # getdefaultlocale() is often more stable than getlocale() on Windows
+        # as it handles the "Chinese (Simplified)_China" style strings better.
+        loc = locale.getdefaultlocale()[0] or ''
+    except (ValueError, TypeError, locale.Error):
+        # ValueError for unknown locale identifiers on Windows
+        pass
+
+    if not loc:
+        try:
+            loc = locale.getlocale(locale.LC_MESSAGES)[0] or ''
+        except (ValueError, TypeError, AttributeError, locale.Error):
+            # locale.LC_MESSAGES itself is missing on Windows (AttributeError)
+            pass
+
+    if _ZH_RE.search(loc):
+        return 'zh'
+
+    # 3. Default to English if no Chinese indicators are found
+    return 'en'
+
+
+def _compile_table(raw: Mapping[str, str]) -> dict[str, tuple[Callable[[dict], str] | None, str]]:
+    """Pair each template with its pre-bound format_map (None for plain strings)
+
+    Keys are interned so lookups with caller-side literals hit CPython's
+    pointer-identity fast path in the dict probe.
+    """
+    return {sys.intern(k): (v.format_map if '{' in v else None, v) for k, v in raw.items()}
+
+
+_COMPILED_EN = _compile_table(_TRANSLATIONS_EN)
+_COMPILED_ZH = _compile_table(_TRANSLATIONS_ZH)
 
 
 class Translator:
     """Simple translator class for internationalization"""
 
-    def __init__(self):
-        self.language = self.detect_language()
-        self.translations = self.load_translations()
+    __slots__ = ('language', '_get', '_plain_cache')
+
+    def __init__(self) -> None:
+        self.language = _detect_language()
+        # Pre-bound lookup into the compiled (formatter, template) table
+        self._get = (_COMPILED_ZH if self.language == 'zh' else _COMPILED_EN).get
+        # Resolved strings for parameterless keys, filled lazily
+        self._plain_cache: dict[str, str] = {}
 
     def detect_language(self) -> str:
-        """
-        Detect system language preference using environment variables and system locale.
-        Prioritizes Chinese (zh) detection, defaults to English (en).
-        """
-        # 1. Check environment variables (highest priority for Unix/macOS/WSL)
-        # LC_ALL > LC_MESSAGES > LANG
-        env_vars = ['LC_ALL', 'LC_MESSAGES', 'LANG']
-        for var in env_vars:
-            value = os.environ.get(var, '').lower()
-            if value:
-                # Matches 'zh', 'zh_CN', 'zh-Hans', 'chinese', etc.
-                if 'zh' in value or 'chinese' in value:
-                    return 'zh'
-
-        # 2. Fallback to system-level locale settings
-        try:
-            # getdefaultlocale() is often more stable than getlocale() on Windows
-            # as it handles the "Chinese (Simplified)_China" style strings better.
-            default_loc = locale.getdefaultlocale()[0]
-            if default_loc:
-                default_loc = default_loc.lower()
-                if 'zh' in default_loc or 'chinese' in default_loc:
-                    return 'zh'
-
-            # Secondary check with the standard getlocale
-            sys_loc = locale.getlocale()[locale.LC_MESSAGES][0]
-            if sys_loc:
-                sys_loc = sys_loc.lower()
-                if 'zh' in sys_loc or 'chinese' in sys_loc:
-                    return 'zh'
-        except (ValueError, Exception):
-            # locale.getlocale() often throws ValueError on Windows 
-            # for unknown locale identifiers; we catch it to remain robust.
-            pass
+        """Detect system language preference (memoized at module level)"""
+        return _detect_language()
 
-        # 3. Default to English if no Chinese indicators are found
-        return 'en'
+    @property
+    def translations(self) -> dict[str, Mapping[str, str]]:
+        """All translation tables (kept for compatibility; tables live at module scope)"""
+        return {'en': _TRANSLATIONS_EN, 'zh': _TRANSLATIONS_ZH}
 
-    def load_translations(self) -> dict[str, dict[str, str]]:
+    def load_translations(self) -> dict[str, Mapping[str, str]]:
         """Load translation strings"""
-        return {
-            'en': {
-                # Loading messages
-                'thinking': 'Thinking...',
-
-                # Command execution
-                'dangerous_pattern_detected': 'Dangerous command pattern detected: {command}',
-                'confirm_dangerous_command': 'Are you sure you want to execute this dangerous command? (YES/no): ',
-                'dangerous_command_cancelled': 'Dangerous command cancelled.',
-                'command_execution_failed': 'Command execution failed, exit code: {exit_code}',
-                # Shell command display
-                'risk_level_prompt': 'This command has a risk level of {risk_level}, still execute? (YES/no): ',
-                'execute_prompt': '[{risk_level}]Execute this command? (y/N): ',
-                'command_not_executed': 'Command not executed.',
-                # Configuration
-                'config_init_error': 'Error initializing config: {error}',
-                'config_file_missing': 'Configuration file missing.',
-                'config_edit_explanation': "This command will open the configuration file with your default editor.\nYou need to configure the provider's API key and related parameters here so the program can properly call the model interface.\nYou can always display this command with {yellow_shai_config}.",
-                # Errors
-                'error': 'Error: {error}',
-                'model_not_found': 'Model not found: {model_name}',
-                'provider_not_configured': 'Provider not configured: {provider_name}',
-                'env_var_not_defined': 'Environment variable not defined: {var_name}',
-                'task_description_empty': 'Task description cannot be empty',
-            },
-            'zh': {
-                # Loading messages
-                'thinking': '思考中...',
-
-                # Command execution
-                'dangerous_pattern_detected': '检测到危险命令模式: {command}',
-                'confirm_dangerous_command': '确定要执行这个危险命令吗？(YES/no): ',
-                'dangerous_command_cancelled': '危险命令已取消。',
-                'command_execution_failed': '命令执行失败，错误码: {exit_code}',
-                # Shell command display
-                'risk_level_prompt': '此命令的风险等级为 {risk_level}，仍然执行吗？(YES/no): ',
-                'execute_prompt': '[{risk_level}]执行此命令？(y/N): ',
-                'command_not_executed': '命令未执行。',
-                # Configuration
-                'config_init_error': '配置文件错误: {error}',
-                'config_file_missing': '配置文件不存在',
-                'config_edit_explanation': "该命令将使用默认编辑器打开配置文件。\n配置服务商的api key及相关参数，以便程序能够正常调用模型接口。\n任何时候可以通过{yellow_shai_config}显示此命令。",
-                # Errors
-                'error': '错误: {error}',
-                'model_not_found': '找不到模型: {model_name}',
-                'provider_not_configured': '未配置Provider: {provider_name}',
-                'env_var_not_defined': '未定义环境变量: {var_name}',
-                'task_description_empty': '任务描述不能为空',
-            }
-        }
+        return self.translations
 
     def get(self, key: str, **kwargs) -> str:
         """Get translated string with formatting"""
-        translation = self.translations[self.language].get(key, key)
-
-        # Format the string if there are kwargs
-        if kwargs:
-            try:
-                return translation.format(**kwargs)
-            except KeyError:
-                # If formatting fails, return the translation as-is
-                return translation
-
-        return translation
+        # Parameterless keys (spinner text, fixed messages) resolve from a
+        # per-instance cache without touching the format machinery
+        if not kwargs:
+            value = self._plain_cache.get(key)
+            if value is None:
+                value = self._get(key, (None, key))[1]
+                self._plain_cache[key] = value
+            return value
+
+        # _SafeDict keeps unknown placeholders verbatim, so no try/except
+        # is needed; the formatter is format_map pre-bound to the template,
+        # None for placeholder-free entries and unknown keys alike
+        formatter, template = self._get(key, (None, key))
+        return formatter(_SafeDict(kwargs)) if formatter else template
 
     def __call__(self, key: str, **kwargs) -> str:
         """Make the translator callable"""
         return self.get(key, **kwargs)
 
 
-# Create global translator instance
-_ = Translator()
+# The global translator instance is created lazily (PEP 562) so importing
+# this module doesn't pay for language detection until a string is needed.
+# The annotation-only declaration keeps type checkers happy without
+# entering globals() at runtime.
+_: Translator
+
+
+def __getattr__(name: str) -> Translator:
+    if name == '_':
+        global _
+        _ = Translator()
+        return _
+    raise AttributeError(name)
 
 
 def get_translator() -> Translator:
     """Get the global translator instance"""
-    return _
\ No newline at end of file
+    return _ if '_' in globals() else __getattr__('_')